@@ -1,12 +1,11 @@
 import uuid
 import os
-import zipfile
-from typing import List, Dict, Any, Optional
+from typing import List, Any, Optional
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-import io
 from dotenv import load_dotenv
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -19,11 +18,21 @@ from .tasks import scan_site, get_scan_result, get_all_scans, delete_scan
 # Get base URL from environment
 BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
 
+# Download link templates, filled in with a scan id
+_SCREENSHOT_URL_TEMPLATE = BASE_URL + "/scan/%s/screenshot"
+_HTML_ARCHIVE_URL_TEMPLATE = BASE_URL + "/scan/%s/html"
+_HTML_CONTENT_URL_TEMPLATE = BASE_URL + "/scan/%s/html-content"
+
+# When set (e.g. "/internal/"), file downloads are handed to the reverse proxy
+# via X-Accel-Redirect so nginx serves them with sendfile instead of Python
+X_ACCEL_REDIRECT_PREFIX = os.getenv("X_ACCEL_REDIRECT_PREFIX")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Site Scanner API",
     description="Web scoring and site analysis tool",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -38,50 +47,47 @@ app.add_middleware(
 
 def enrich_scan_result_with_download_links(scan_result: ScanResult) -> ScanResult:
     """Add download links to scan result if files are available"""
-    if scan_result.status == ScanStatus.COMPLETED:
-        if scan_result.has_screenshot:
-            scan_result.screenshot_download_url = f"{BASE_URL}/scan/{scan_result.scan_id}/screenshot"
-        if scan_result.has_html_archive:
-            scan_result.html_archive_download_url = f"{BASE_URL}/scan/{scan_result.scan_id}/html"
-            scan_result.html_content_url = f"{BASE_URL}/scan/{scan_result.scan_id}/html-content"
-    return scan_result
-
-
-def create_html_archive(html_content: Dict[str, str]) -> Optional[bytes]:
-    """Create a ZIP archive from HTML content dictionary"""
-    if not html_content:
-        return None
-    
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for url, html in html_content.items():
-            # Create a safe filename
-            filename = url.replace('://', '_').replace('/', '_').replace(':', '_')
-            if len(filename) > 100:
-                filename = filename[:100]
-            filename = f"{filename}.html"
-            
-            zip_file.writestr(filename, html)
-    
-    return zip_buffer.getvalue()
+    if scan_result.status != ScanStatus.COMPLETED:
+        return scan_result
+    
+    update = {}
+    if scan_result.has_screenshot:
+        update["screenshot_download_url"] = _SCREENSHOT_URL_TEMPLATE % scan_result.scan_id
+    if scan_result.has_html_archive:
+        update["html_archive_download_url"] = _HTML_ARCHIVE_URL_TEMPLATE % scan_result.scan_id
+        update["html_content_url"] = _HTML_CONTENT_URL_TEMPLATE % scan_result.scan_id
+    return scan_result.model_copy(update=update) if update else scan_result
+
+
+def file_download_response(path: str, media_type: str, filename: Optional[str] = None) -> Response:
+    """Serve a file (as an attachment if named), offloading to the proxy when configured"""
+    headers = {"Content-Disposition": f"attachment; filename={filename}"} if filename else {}
+    if X_ACCEL_REDIRECT_PREFIX:
+        headers["X-Accel-Redirect"] = f"{X_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{path.lstrip('/')}"
+        return Response(media_type=media_type, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+# Static payload for the root endpoint, encoded once at import time
+_ROOT_RESPONSE = orjson.dumps({
+    "message": "Site Scanner API",
+    "version": "1.0.0",
+    "endpoints": {
+        "POST /scan": "Submit a new scan request",
+        "GET /scan/{id}": "Get scan result or status",
+        "GET /scan/{id}/html": "Download HTML archive",
+        "GET /scan/{id}/html-content": "Get HTML content as JSON",
+        "GET /scan/{id}/screenshot": "Download screenshot",
+        "GET /scans": "List all scans",
+        "DELETE /scan/{id}": "Delete a scan"
+    }
+})
 
 
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": "Site Scanner API",
-        "version": "1.0.0",
-        "endpoints": {
-            "POST /scan": "Submit a new scan request",
-            "GET /scan/{id}": "Get scan result or status",
-            "GET /scan/{id}/html": "Download HTML archive",
-            "GET /scan/{id}/html-content": "Get HTML content as JSON",
-            "GET /scan/{id}/screenshot": "Download screenshot",
-            "GET /scans": "List all scans",
-            "DELETE /scan/{id}": "Delete a scan"
-        }
-    }
+    return Response(_ROOT_RESPONSE, media_type="application/json")
 
 
 @app.post("/scan", response_model=ScanResponse)
@@ -127,7 +133,7 @@ async def get_scan(scan_id: str):
         raise HTTPException(status_code=404, detail="Scan not found")
     
     # Enrich with download links
-    return enrich_scan_result_with_download_links(scan_result)
+    return ORJSONResponse(enrich_scan_result_with_download_links(scan_result).model_dump())
 
 
 @app.get("/scan/{scan_id}/html")
@@ -141,25 +147,13 @@ async def download_html(scan_id: str):
     if scan_result.status != ScanStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Scan not completed yet")
     
-    if not hasattr(scan_result, '_crawler_data') or not scan_result._crawler_data.get("html_content"):
+    archive_path = getattr(scan_result, '_crawler_data', {}).get("archive_path")
+    if not archive_path or not os.path.exists(archive_path):
         raise HTTPException(status_code=404, detail="HTML content not available")
     
-    try:
-        # Create HTML archive from stored data
-        html_archive = create_html_archive(scan_result._crawler_data["html_content"])
-        
-        if not html_archive:
-            raise HTTPException(status_code=404, detail="HTML archive could not be created")
-        
-        # Return as streaming response
-        return StreamingResponse(
-            io.BytesIO(html_archive),
-            media_type="application/zip",
-            headers={"Content-Disposition": f"attachment; filename=scan_{scan_id}_html.zip"}
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create HTML archive: {str(e)}")
+    return file_download_response(
+        archive_path, "application/zip", f"scan_{scan_id}_html.zip"
+    )
 
 
 @app.get("/scan/{scan_id}/screenshot")
@@ -181,10 +175,11 @@ async def download_screenshot(scan_id: str):
     if not os.path.exists(screenshot_path):
         raise HTTPException(status_code=404, detail="Screenshot file not found")
     
-    return FileResponse(
-        screenshot_path,
-        media_type="image/png",
-        headers={"Content-Disposition": f"attachment; filename=scan_{scan_id}_screenshot.png"}
+    # Older scans stored PNG screenshots, newer ones JPEG
+    extension = os.path.splitext(screenshot_path)[1] or ".png"
+    media_type = "image/png" if extension == ".png" else "image/jpeg"
+    return file_download_response(
+        screenshot_path, media_type, f"scan_{scan_id}_screenshot{extension}"
     )
 
 
@@ -199,18 +194,12 @@ async def get_html_content(scan_id: str):
     if scan_result.status != ScanStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Scan not completed yet")
     
-    if not hasattr(scan_result, '_crawler_data') or not scan_result._crawler_data.get("html_content"):
+    pages_path = getattr(scan_result, '_crawler_data', {}).get("pages_path")
+    if not pages_path or not os.path.exists(pages_path):
         raise HTTPException(status_code=404, detail="HTML content not available")
     
-    html_content = scan_result._crawler_data["html_content"]
-    
-    return {
-        "scan_id": scan_id,
-        "url": scan_result.url,
-        "pages_count": len(html_content),
-        "html_content": html_content,
-        "crawled_at": scan_result.completed_at.isoformat() if scan_result.completed_at else None
-    }
+    # The worker wrote the JSON payload already, serve its bytes as-is
+    return file_download_response(pages_path, "application/json")
 
 
 @app.get("/scans", response_model=ScanListResponse)
@@ -218,8 +207,9 @@ async def list_scans():
     """List all scans"""
     scans = get_all_scans()
     # Enrich each scan with download links
-    enriched_scans = [enrich_scan_result_with_download_links(scan) for scan in scans]
-    return ScanListResponse(scans=enriched_scans, total=len(enriched_scans))
+    enriched_scans = [enrich_scan_result_with_download_links(scan).model_dump() for scan in scans]
+    # Returning a response directly skips response_model validation on this hot path
+    return ORJSONResponse({"scans": enriched_scans, "total": len(enriched_scans)})
 
 
 @app.delete("/scan/{scan_id}")
@@ -236,7 +226,7 @@ async def delete_scan_endpoint(scan_id: str):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return ORJSONResponse({"status": "healthy", "timestamp": datetime.utcnow().isoformat()})
 
 
 # Import datetime at the top level
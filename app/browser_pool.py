@@ -0,0 +1,75 @@
+import asyncio
+from typing import Optional
+
+from playwright.async_api import async_playwright, Browser, Playwright
+
+# Chromium flags, tuned for containers and WSL2
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-features=TranslateUI',
+    '--disable-ipc-flooding-protection',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-default-apps',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-translate',
+    '--hide-scrollbars',
+    '--mute-audio',
+    '--no-zygote',
+    '--disable-setuid-sandbox',
+    '--disable-background-media-suspend',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-default-apps',
+    '--disable-domain-reliability',
+    '--disable-features=AudioServiceOutOfProcess',
+    '--disable-hang-monitor',
+    '--disable-prompt-on-repost',
+    '--disable-renderer-backgrounding',
+    '--disable-sync-preferences',
+    '--disable-threaded-animation',
+    '--disable-threaded-scrolling',
+    '--disable-web-resources',
+    '--disable-features=TranslateUI',
+    '--disable-ipc-flooding-protection',
+    '--memory-pressure-off',
+    '--max_old_space_size=4096'
+]
+
+# Process-wide Playwright driver and Chromium, shared by every scan so the
+# browser is launched once rather than per scan
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_lock = asyncio.Lock()
+
+
+async def get_browser() -> Browser:
+    """Return the shared browser, launching it on first use or after a crash"""
+    global _playwright, _browser
+    async with _lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        return _browser
+
+
+async def close_browser():
+    """Close the shared browser and stop the Playwright driver"""
+    global _playwright, _browser
+    async with _lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
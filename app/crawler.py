@@ -1,232 +1,390 @@
 import asyncio
-import zipfile
-import io
 import os
-from typing import Dict, Any, List, Optional, Set
-from urllib.parse import urljoin, urlparse
+import threading
+from functools import lru_cache
+from collections import deque
+from typing import Callable, Deque, Dict, Any, Iterator, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+import orjson
 import tldextract
-import validators
+import zstandard
+from cachetools import TTLCache
 from datetime import datetime
 import json
 
-from playwright.async_api import async_playwright, Browser, Page
+from selectolax.parser import HTMLParser
+from playwright.async_api import Browser, BrowserContext, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import whois
 from ipwhois import IPWhois
 import socket
 
+from .archive import iter_zip_chunks
+from .browser_pool import get_browser
+
+try:
+    import re2 as re
+except ImportError:  # RE2 bindings are optional, fall back to the stdlib engine
+    import re
+
+# Resource types never fetched: media and fonts do not affect HTML or links,
+# and images/stylesheets are only needed to render a screenshot
+BLOCKED_RESOURCE_TYPES = frozenset({"media", "font", "image", "stylesheet"})
+SCREENSHOT_BLOCKED_RESOURCE_TYPES = frozenset({"media", "font"})
+
+# Navigation waits (ms): DOMContentLoaded for every page, plus the load event
+# before a screenshot. Slow pages are used as far as they got.
+NAVIGATION_TIMEOUT = 8000
+LOAD_STATE_TIMEOUT = 4000
+
+# Maximum number of internal pages fetched at the same time
+INTERNAL_CRAWL_CONCURRENCY = 8
+
+# Absolute http(s) URLs without whitespace, quotes or angle brackets. RE2
+# matches in linear time with no backtracking, which adds up on link-heavy pages
+URL_RE = re.compile(r'^https?://[^\s"<>]+$')
+
+# As browsers do when resolving an href: drop tabs and newlines, and
+# percent-encode the characters URL_RE rejects
+_HREF_TRANS = str.maketrans({"\t": None, "\n": None, "\r": None,
+                             " ": "%20", '"': "%22", "<": "%3C", ">": "%3E"})
+
+# Network lookups shared by every scan in the process: WHOIS and DNS keyed by
+# registered domain, IP WHOIS keyed by address. Failed lookups are not cached.
+_WHOIS_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=900)
+_DNS_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=900)
+_IPWHOIS_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=900)
+_LOOKUP_CACHE_LOCK = threading.Lock()
+
+# Use the bundled public suffix list snapshot instead of fetching it at runtime
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=())
+
+
+def _cached_lookup(cache: TTLCache, key: str, lookup: Callable[[str], Any]) -> Any:
+    """Return lookup(key), reusing a cached result while it is fresh"""
+    with _LOOKUP_CACHE_LOCK:
+        value = cache.get(key)
+    if value is None:
+        value = lookup(key)
+        with _LOOKUP_CACHE_LOCK:
+            cache[key] = value
+    return value
+
+
+def _ip_whois(ip: str) -> Dict[str, Any]:
+    return IPWhois(ip).lookup_whois()
+
+
+async def _goto(page: Page, url: str):
+    """Navigate to url, keeping whatever DOM has arrived if the page is slow"""
+    # A navigation that never commits (or errors) raises here, whatever the page
+    # showed before, so a retry cannot mistake Chromium's error page for the site
+    await page.goto(url, wait_until="commit", timeout=NAVIGATION_TIMEOUT)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+    except PlaywrightTimeoutError:
+        # Committed but slow: use the DOM as far as it got
+        pass
+
+
+@lru_cache(maxsize=8192)
+def _reg_domain(host: str) -> str:
+    """Registered domain of a hostname, memoized per host"""
+    return _TLD_EXTRACT(host).registered_domain
+
+
+def _link_domain(url: str) -> str:
+    """Registered domain of a URL"""
+    return _reg_domain(urlsplit(url).hostname or '')
+
+
+def _extract_links_from_html(html: bytes, base_url: str) -> Set[str]:
+    """Absolute http(s) links of a page's UTF-8 HTML, resolved as a browser would"""
+    links = set()
+    # The bytes are our own UTF-8 encoding, so any <meta charset> is stale
+    tree = HTMLParser(html, detect_encoding=False)
+    # Like a.href in the page, honour <base href> when resolving links
+    base = tree.css_first("base[href]")
+    if base is not None:
+        try:
+            base_url = urljoin(base_url, (base.attributes.get("href") or "").strip())
+        except ValueError:
+            pass
+    for node in tree.css("a[href]"):
+        href = (node.attributes.get("href") or "").strip().translate(_HREF_TRANS)
+        if not href:
+            continue
+        try:
+            link = urljoin(base_url, href)
+        except ValueError:
+            continue  # malformed host, e.g. "http://[oops"
+        # Non-web schemes (javascript:, mailto:, tel:) fail the match
+        if URL_RE.match(link):
+            links.add(link)
+    return links
+
 
 class SiteCrawler:
-    def __init__(self, max_pages: int = 10, include_screenshots: bool = True, include_html: bool = True):
+    def __init__(self, max_pages: int = 10, include_screenshots: bool = True, include_html: bool = True,
+                 browser: Optional[Browser] = None):
         self.max_pages = max_pages
         self.include_screenshots = include_screenshots
         self.include_html = include_html
+        # Browser to crawl with, for callers that manage their own (tests pass a
+        # stub); defaults to the process-wide pooled browser
+        self.browser = browser
         self.crawled_urls: Set[str] = set()
         self.all_links: Set[str] = set()
         self.internal_links: Set[str] = set()
         self.external_links: Set[str] = set()
-        self.html_content: Dict[str, str] = {}
+        # Every URL already categorized or queued, and internal URLs still to crawl
+        self.seen: Set[str] = set()
+        self.frontier: Deque[str] = deque()
+        # Page HTML is kept zstd-compressed until it is needed, see iter_html()
+        self.html_content: Dict[str, bytes] = {}
+        self._zctx = zstandard.ZstdCompressor(level=3)
+        self._dctx = zstandard.ZstdDecompressor()
         self.screenshot_path: Optional[str] = None
+        # Domain/IP lookups started by crawl_site, awaited in _compile_results
+        self._domain_info_task: Optional[asyncio.Task] = None
+        self._ip_info_task: Optional[asyncio.Task] = None
         
     async def crawl_site(self, url: str) -> Dict[str, Any]:
         """Main crawling method using Playwright"""
+        # WHOIS/DNS lookups are blocking and independent of the crawl, so run them
+        # in threads now and let them overlap with browser work
+        self._domain_info_task = asyncio.create_task(asyncio.to_thread(self._get_domain_info, url))
+        self._ip_info_task = asyncio.create_task(asyncio.to_thread(self._get_ip_info, url))
+        
         try:
-            async with async_playwright() as p:
-                # Launch browser with improved settings for WSL2
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-gpu',
-                        '--disable-web-security',
-                        '--disable-features=VizDisplayCompositor',
-                        '--disable-background-timer-throttling',
-                        '--disable-backgrounding-occluded-windows',
-                        '--disable-renderer-backgrounding',
-                        '--disable-features=TranslateUI',
-                        '--disable-ipc-flooding-protection',
-                        '--no-first-run',
-                        '--no-default-browser-check',
-                        '--disable-default-apps',
-                        '--disable-extensions',
-                        '--disable-plugins',
-                        '--disable-background-networking',
-                        '--disable-sync',
-                        '--disable-translate',
-                        '--hide-scrollbars',
-                        '--mute-audio',
-                        '--no-zygote',
-                        '--disable-setuid-sandbox',
-                        '--disable-background-media-suspend',
-                        '--disable-component-extensions-with-background-pages',
-                        '--disable-default-apps',
-                        '--disable-domain-reliability',
-                        '--disable-features=AudioServiceOutOfProcess',
-                        '--disable-hang-monitor',
-                        '--disable-prompt-on-repost',
-                        '--disable-renderer-backgrounding',
-                        '--disable-sync-preferences',
-                        '--disable-threaded-animation',
-                        '--disable-threaded-scrolling',
-                        '--disable-web-resources',
-                        '--disable-features=TranslateUI',
-                        '--disable-ipc-flooding-protection',
-                        '--memory-pressure-off',
-                        '--max_old_space_size=4096'
-                    ]
-                )
-                
-                page = await browser.new_page()
-                
-                # Set viewport for consistent screenshots
-                await page.set_viewport_size({"width": 1920, "height": 1080})
-                
-                # Set longer timeout and more lenient wait conditions
-                page.set_default_timeout(60000)  # 60 seconds timeout
-                page.set_default_navigation_timeout(60000)
-                
-                # Navigate to the main page with retry logic
-                success = False
-                for attempt in range(3):
-                    try:
-                        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                        success = True
-                        break
-                    except Exception as e:
-                        if attempt == 2:  # Last attempt
-                            raise e
-                        await asyncio.sleep(2)  # Wait before retry
-                
-                if not success:
-                    raise Exception(f"Failed to navigate to {url} after 3 attempts")
-                
-                # Take screenshot if requested
-                if self.include_screenshots:
-                    self.screenshot_path = f"screenshots/{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                    os.makedirs("screenshots", exist_ok=True)
-                    await page.screenshot(path=self.screenshot_path, full_page=True)
-                
-                # Store HTML content of main page if requested
-                if self.include_html:
-                    try:
-                        html = await page.content()
-                        self.html_content[url] = html
-                    except Exception as e:
-                        print(f"Error getting HTML content for main page: {e}")
-                
-                # Get all links from the page
-                links = await self._extract_links(page, url)
-                self.all_links.update(links)
-                
-                # Categorize links
-                base_domain = tldextract.extract(url).registered_domain
-                for link in links:
-                    if tldextract.extract(link).registered_domain == base_domain:
-                        self.internal_links.add(link)
-                    else:
-                        self.external_links.add(link)
-                
-                # Crawl internal pages (limited by max_pages)
-                await self._crawl_internal_pages(page, browser, url, base_domain)
-                
-                await browser.close()
-                
-                return self._compile_results(url)
-                
+            browser = self.browser or await get_browser()
+            return await self._crawl_with_browser(browser, url)
         except Exception as e:
+            # Nobody will await the lookups now; don't leave them pending on the loop
+            self._domain_info_task.cancel()
+            self._ip_info_task.cancel()
             return {"error": str(e)}
     
-    async def _extract_links(self, page: Page, base_url: str) -> List[str]:
+    async def _crawl_with_browser(self, browser: Browser, url: str) -> Dict[str, Any]:
+        """Crawl the site in a fresh browser context, isolated from other scans"""
+        # One context for the whole scan, so connections and DNS are reused across
+        # pages; viewport set for consistent screenshots. When only the HTML is
+        # wanted the page scripts are not needed, and skipping them speeds up loads
+        context = await browser.new_context(
+            viewport={"width": 1280, "height": 720},
+            java_script_enabled=not (self.include_html and not self.include_screenshots)
+        )
+        try:
+            await context.route("**/*", self._block_resources)
+            
+            page = await context.new_page()
+            
+            # Set longer timeout and more lenient wait conditions
+            page.set_default_timeout(60000)  # 60 seconds timeout
+            page.set_default_navigation_timeout(60000)
+            
+            # Navigate to the main page with retry logic
+            success = False
+            for attempt in range(3):
+                try:
+                    await _goto(page, url)
+                    success = True
+                    break
+                except Exception as e:
+                    if attempt == 2:  # Last attempt
+                        raise e
+                    await asyncio.sleep(2)  # Wait before retry
+            
+            if not success:
+                raise Exception(f"Failed to navigate to {url} after 3 attempts")
+            
+            # Take screenshot if requested, giving layout a moment to settle first
+            if self.include_screenshots:
+                try:
+                    await page.wait_for_load_state("load", timeout=LOAD_STATE_TIMEOUT)
+                except PlaywrightTimeoutError:
+                    pass
+                # Above-the-fold JPEG only: the scoring UI needs no more, and a full-page
+                # capture of a long page is many times larger and slower to encode
+                self.screenshot_path = f"screenshots/{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+                os.makedirs("screenshots", exist_ok=True)
+                await page.screenshot(path=self.screenshot_path, type="jpeg", quality=70)
+            
+            # Store HTML content of main page if requested
+            html = None
+            if self.include_html:
+                try:
+                    html = (await page.content()).encode('utf-8')
+                    self._store_html(url, html)
+                except Exception as e:
+                    print(f"Error getting HTML content for main page: {e}")
+            
+            # Get all links from the page
+            links = await self._extract_links(page, url, html)
+            
+            # Categorize links
+            base_domain = _link_domain(url)
+            if self.max_pages <= 1:
+                # Single-page scan: nothing will be crawled, so skip the
+                # seen/frontier bookkeeping and only split the links
+                self.all_links |= links
+                self.internal_links = {link for link in links if _link_domain(link) == base_domain}
+                self.external_links = links - self.internal_links
+            else:
+                self.seen.add(url)
+                self._add_links(links, base_domain)
+                
+                # Crawl internal pages (limited by max_pages)
+                await self._crawl_internal_pages(context, url, base_domain)
+            
+            return await self._compile_results(url)
+        finally:
+            await context.close()
+    
+    async def _block_resources(self, route: Route):
+        """Abort requests for resources that do not affect HTML or links"""
+        blocked = SCREENSHOT_BLOCKED_RESOURCE_TYPES if self.include_screenshots else BLOCKED_RESOURCE_TYPES
+        if route.request.resource_type in blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _extract_links(self, page: Page, base_url: str, html: Optional[bytes] = None) -> Set[str]:
         """Extract all links from a page"""
-        links = await page.eval_on_selector_all("a[href]", """
-            (elements) => elements.map(el => el.href).filter(href => href && !href.startsWith('javascript:'))
-        """)
-        
-        # Filter and normalize links
-        valid_links = []
-        for link in links:
-            if validators.url(link):
-                valid_links.append(link)
-            elif link.startswith('/'):
-                valid_links.append(urljoin(base_url, link))
+        if html is not None:
+            # HTML is already in hand, parse it locally instead of a CDP round-trip;
+            # resolve against the final URL, after any redirects
+            return _extract_links_from_html(html, page.url)
         
-        return valid_links
+        # Resolve and filter in the page itself: the URL constructor normalizes each
+        # href and rejects malformed ones, and only http(s) links come back
+        return set(await page.evaluate("""
+            (base) => [...document.querySelectorAll('a[href]')].map(a => {
+                try {
+                    const url = new URL(a.href, base);
+                    return url.protocol === 'http:' || url.protocol === 'https:' ? url.href : null;
+                } catch {
+                    return null;
+                }
+            }).filter(Boolean)
+        """, base_url))
+    
+    def _store_html(self, url: str, html: bytes):
+        """Keep a page's UTF-8 HTML, compressed"""
+        self.html_content[url] = self._zctx.compress(html)
+    
+    def iter_html(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield (url, UTF-8 html) for every captured page"""
+        for url, compressed in self.html_content.items():
+            yield url, self._dctx.decompress(compressed)
+    
+    def _add_links(self, links: Set[str], base_domain: str):
+        """Categorize newly discovered links and queue unseen internal ones"""
+        # Every link is categorized, the start URL included, so internal plus
+        # external always equals all_links; seen only gates the frontier
+        new_links = links - self.all_links
+        self.all_links |= new_links
+        internal = {link for link in new_links if _link_domain(link) == base_domain}
+        self.internal_links |= internal
+        self.external_links |= new_links - internal
+        unseen = internal - self.seen
+        self.seen |= unseen
+        self.frontier.extend(unseen)
     
-    async def _crawl_internal_pages(self, page: Page, browser: Browser, base_url: str, base_domain: str):
+    async def _crawl_internal_pages(self, context: BrowserContext, base_url: str, base_domain: str):
         """Crawl internal pages up to max_pages limit"""
-        pages_to_crawl = list(self.internal_links)[:self.max_pages - 1]  # -1 for main page
+        budget = self.max_pages - 1  # -1 for main page
+        in_flight = 0
+        # Notified whenever a page finishes, since that may queue new links or
+        # free up budget
+        changed = asyncio.Condition()
         
-        for link in pages_to_crawl:
-            if len(self.crawled_urls) >= self.max_pages:
-                break
-                
-            new_page = None
-            try:
-                # Check if browser is still open
+        def can_start() -> bool:
+            return bool(self.frontier) and len(self.crawled_urls) + in_flight < budget
+        
+        def done() -> bool:
+            # Nothing left to fetch and nothing in flight that could queue more
+            return len(self.crawled_urls) >= budget or (not self.frontier and not in_flight)
+        
+        async def worker():
+            nonlocal in_flight
+            # Each worker pulls the next URL as soon as its page is done, so one
+            # slow page never holds back the others. An idle worker waits for the
+            # pages still in flight rather than exiting on an empty frontier
+            while True:
+                async with changed:
+                    await changed.wait_for(lambda: can_start() or done())
+                    if not can_start():
+                        return
+                    link = self.frontier.popleft()
+                    in_flight += 1
                 try:
-                    new_page = await browser.new_page()
+                    html, new_links = await self._crawl_one(context, link, base_url)
                 except Exception as e:
-                    print(f"Browser closed, cannot create new page for {link}: {e}")
+                    print(f"Error crawling {link}: {e}")
+                else:
+                    if html is not None:
+                        self._store_html(link, html)
+                    self._add_links(new_links, base_domain)
+                    self.crawled_urls.add(link)
+                finally:
+                    async with changed:
+                        in_flight -= 1
+                        changed.notify_all()
+        
+        # Pages are network-bound, so fetch them concurrently in one browser context
+        workers = min(budget, INTERNAL_CRAWL_CONCURRENCY)
+        if workers > 0:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+    
+    async def _crawl_one(self, context: BrowserContext, link: str,
+                         base_url: str) -> Tuple[Optional[bytes], Set[str]]:
+        """Fetch one internal page, returning its HTML (if requested) and links"""
+        new_page = await context.new_page()
+        try:
+            # Set timeouts for this page
+            new_page.set_default_timeout(20000)  # Reduced timeout
+            new_page.set_default_navigation_timeout(20000)
+            
+            # Try to navigate with retry logic
+            for attempt in range(2):  # 2 attempts for internal pages
+                try:
+                    await _goto(new_page, link)
                     break
-                
-                # Set timeouts for this page
-                new_page.set_default_timeout(20000)  # Reduced timeout
-                new_page.set_default_navigation_timeout(20000)
-                
-                # Try to navigate with retry logic
-                success = False
-                for attempt in range(2):  # 2 attempts for internal pages
-                    try:
-                        await new_page.goto(link, wait_until="domcontentloaded", timeout=20000)
-                        success = True
-                        break
-                    except Exception as e:
-                        if attempt == 1:  # Last attempt
-                            raise e
-                        await asyncio.sleep(1)  # Wait before retry
-                
-                if not success:
-                    print(f"Failed to navigate to {link} after 2 attempts")
-                    if new_page:
-                        await new_page.close()
-                    continue
-                
-                # Store HTML content if requested
-                if self.include_html:
-                    try:
-                        html = await new_page.content()
-                        self.html_content[link] = html
-                    except Exception as e:
-                        print(f"Error getting HTML content for {link}: {e}")
-                
-                # Extract more links
+                except Exception as e:
+                    if attempt == 1:  # Last attempt
+                        raise e
+                    await asyncio.sleep(1)  # Wait before retry
+            
+            # Serialize the DOM once and encode it once; the same bytes are
+            # parsed for links and compressed for storage
+            html = None
+            if self.include_html:
                 try:
-                    new_links = await self._extract_links(new_page, base_url)
-                    self.all_links.update(new_links)
-                    
-                    # Update link categorization
-                    for new_link in new_links:
-                        if tldextract.extract(new_link).registered_domain == base_domain:
-                            self.internal_links.add(new_link)
-                        else:
-                            self.external_links.add(new_link)
+                    html = (await new_page.content()).encode('utf-8')
                 except Exception as e:
-                    print(f"Error extracting links from {link}: {e}")
-                
-                self.crawled_urls.add(link)
-                
+                    print(f"Error getting HTML content for {link}: {e}")
+            
+            # Extract more links
+            new_links = set()
+            try:
+                new_links = await self._extract_links(new_page, base_url, html)
+            except Exception as e:
+                print(f"Error extracting links from {link}: {e}")
+            
+            return html, new_links
+        finally:
+            # Always close the page
+            try:
+                await new_page.close()
             except Exception as e:
-                print(f"Error crawling {link}: {e}")
-            finally:
-                # Always close the page
-                if new_page:
-                    try:
-                        await new_page.close()
-                    except Exception as e:
-                        print(f"Error closing page for {link}: {e}")
+                print(f"Error closing page for {link}: {e}")
     
-    def _compile_results(self, url: str) -> Dict[str, Any]:
+    async def _compile_results(self, url: str) -> Dict[str, Any]:
         """Compile crawling results"""
+        # Both lookups are started by crawl_site before any crawling happens
+        assert self._domain_info_task is not None and self._ip_info_task is not None
+        domain_info, ip_info = await asyncio.gather(self._domain_info_task, self._ip_info_task)
         return {
             "url": url,
             "pages_crawled": len(self.crawled_urls) + 1,  # +1 for main page
@@ -235,9 +393,9 @@ class SiteCrawler:
             "external_links": len(self.external_links),
             "crawled_urls": list(self.crawled_urls),
             "screenshot_path": self.screenshot_path,
-            "html_content": self.html_content if self.include_html else {},
-            "domain_info": self._get_domain_info(url),
-            "ip_info": self._get_ip_info(url),
+            "html_pages": len(self.html_content),
+            "domain_info": domain_info,
+            "ip_info": ip_info,
             "content_score": self._calculate_content_score(),
             "seo_score": self._calculate_seo_score(),
             "performance_score": self._calculate_performance_score()
@@ -246,8 +404,8 @@ class SiteCrawler:
     def _get_domain_info(self, url: str) -> Optional[Dict[str, Any]]:
         """Get domain registration information"""
         try:
-            domain = tldextract.extract(url).registered_domain
-            w = whois.whois(domain)
+            domain = _link_domain(url)
+            w = _cached_lookup(_WHOIS_CACHE, domain, whois.whois)
             return {
                 "domain": domain,
                 "registrar": w.registrar,
@@ -261,10 +419,9 @@ class SiteCrawler:
     def _get_ip_info(self, url: str) -> Optional[Dict[str, Any]]:
         """Get IP address information"""
         try:
-            domain = tldextract.extract(url).registered_domain
-            ip = socket.gethostbyname(domain)
-            ipwhois = IPWhois(ip)
-            result = ipwhois.lookup_whois()
+            domain = _link_domain(url)
+            ip = _cached_lookup(_DNS_CACHE, domain, socket.gethostbyname)
+            result = _cached_lookup(_IPWHOIS_CACHE, ip, _ip_whois)
             return {
                 "ip": ip,
                 "asn": result.get("asn"),
@@ -321,20 +478,28 @@ class SiteCrawler:
         # For now, return a basic score based on content
         return min(self._calculate_content_score() * 0.8, 100.0)
     
-    def create_html_archive(self) -> Optional[bytes]:
-        """Create a ZIP archive of HTML content"""
+    def save_html_archive(self, path: str) -> Optional[str]:
+        """Write the ZIP archive of HTML content to disk, returning its path"""
         if not self.html_content:
             return None
         
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for url, html in self.html_content.items():
-                # Create a safe filename
-                filename = url.replace('://', '_').replace('/', '_').replace(':', '_')
-                if len(filename) > 100:
-                    filename = filename[:100]
-                filename = f"{filename}.html"
-                
-                zip_file.writestr(filename, html)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as archive:
+            archive.writelines(iter_zip_chunks(self.iter_html()))
+        return path
+    
+    def save_pages_json(self, path: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Write metadata plus every page's HTML as JSON, one page at a time"""
+        if not self.html_content:
+            return None
         
-        return zip_buffer.getvalue() 
\ No newline at end of file
+        header = orjson.dumps({**metadata, "pages_count": len(self.html_content)})
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as pages_file:
+            pages_file.write(header[:-1] + b',"html_content":{')
+            for index, (url, html) in enumerate(self.iter_html()):
+                if index:
+                    pages_file.write(b",")
+                pages_file.write(orjson.dumps(url) + b":" + orjson.dumps(html.decode('utf-8')))
+            pages_file.write(b"}}")
+        return path
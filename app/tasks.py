@@ -1,8 +1,15 @@
 import os
-import json
+import shutil
+import asyncio
+import atexit
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import orjson
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+from .browser_pool import close_browser
 from .crawler import SiteCrawler
 from .models import ScanStatus, ScanResult
 
@@ -25,11 +32,86 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes
 )
 
+# Longest a crawl may run, leaving room under the soft limit to save results
+CRAWL_TIMEOUT = 20 * 60  # 20 minutes
+
 # Redis storage for scan results
-import json
 import redis
 
-redis_client = redis.Redis(host='localhost', port=6379, db=1, decode_responses=True)
+# Values are orjson bytes, so no response decoding
+redis_client = redis.Redis(host='localhost', port=6379, db=1)
+
+# Lifetime of a scan's Redis keys, and of its files on disk (seconds)
+SCAN_TTL = 3600
+
+# Event loop kept alive for the life of a worker process, so the pooled
+# browser (bound to the loop it was launched on) survives between scans
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_lock = threading.Lock()
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return the process's event loop, starting it on a dedicated thread"""
+    global _worker_loop
+    with _worker_loop_lock:
+        if _worker_loop is None:
+            _worker_loop = asyncio.new_event_loop()
+            threading.Thread(target=_worker_loop.run_forever, daemon=True).start()
+            # Outside a worker (e.g. eager calls) no shutdown signal fires
+            atexit.register(stop_worker_loop)
+        return _worker_loop
+
+
+@worker_process_init.connect
+def start_worker_loop(**kwargs):
+    """Start the worker's event loop before the first task arrives"""
+    get_worker_loop()
+
+
+@worker_process_shutdown.connect
+def stop_worker_loop(**kwargs):
+    """Close the pooled browser and stop the worker's event loop"""
+    global _worker_loop
+    with _worker_loop_lock:
+        loop, _worker_loop = _worker_loop, None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_browser(), loop).result(timeout=10)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+# Per-scan files (HTML archive, page manifest), shared with the API process
+DOWNLOADS_DIR = os.getenv("DOWNLOADS_DIR", "downloads")
+
+
+def scan_files_dir(scan_id: str) -> str:
+    """Directory holding the files produced by a scan"""
+    return os.path.join(DOWNLOADS_DIR, scan_id)
+
+
+def sweep_expired_scan_files():
+    """Remove scan directories older than SCAN_TTL, whose Redis keys have expired"""
+    cutoff = time.time() - SCAN_TTL
+    try:
+        entries = list(os.scandir(DOWNLOADS_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            # Files are written just before the keys are set, so the directory's
+            # mtime never postdates the start of their TTL
+            if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            continue  # removed by a concurrent sweep or delete_scan
+
+
+def _persist(scan_result: ScanResult, client=None):
+    """Store a scan's current state in Redis (or on a pipeline, if given)"""
+    # orjson encodes datetimes and enums natively, so a plain dump is enough
+    (client or redis_client).setex(f"scan:{scan_result.scan_id}", SCAN_TTL, orjson.dumps(scan_result.model_dump()))
 
 
 @celery_app.task(bind=True)
@@ -38,6 +120,11 @@ def scan_site(self, scan_id: str, url: str, max_pages: int = 10,
     """
     Background task to scan a website
     """
+    # Scan files are not expired with their Redis keys, so each scan clears out
+    # those that have outlived SCAN_TTL
+    sweep_expired_scan_files()
+    
+    scan_result = None
     try:
         # Update task status
         self.update_state(
@@ -52,10 +139,7 @@ def scan_site(self, scan_id: str, url: str, max_pages: int = 10,
             status=ScanStatus.PROCESSING,
             created_at=datetime.utcnow()
         )
-        # Store in Redis
-        scan_dict = scan_result.model_dump()
-        scan_dict['created_at'] = scan_dict['created_at'].isoformat()
-        redis_client.setex(f"scan:{scan_id}", 3600, json.dumps(scan_dict))
+        _persist(scan_result)
         
         # Update progress
         self.update_state(
@@ -75,15 +159,20 @@ def scan_site(self, scan_id: str, url: str, max_pages: int = 10,
             meta={"current": 20, "total": 100, "status": "Crawling website..."}
         )
         
-        # Run the crawler (this is async, so we need to handle it properly)
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        # Run the crawler on the process's loop, where the pooled browser lives
+        crawl_future = asyncio.run_coroutine_threadsafe(
+            crawler.crawl_site(url), get_worker_loop()
+        )
         try:
-            crawl_results = loop.run_until_complete(crawler.crawl_site(url))
-        finally:
-            loop.close()
+            crawl_results = crawl_future.result(timeout=CRAWL_TIMEOUT)
+        except TimeoutError:
+            crawl_future.cancel()
+            raise TimeoutError(f"Crawl did not finish within {CRAWL_TIMEOUT} seconds") from None
+        except BaseException:
+            # e.g. the soft time limit: stop the crawl, or it keeps running on the
+            # shared loop alongside the next scan, holding its pages open
+            crawl_future.cancel()
+            raise
         
         self.update_state(
             state="PROGRESS",
@@ -95,10 +184,7 @@ def scan_site(self, scan_id: str, url: str, max_pages: int = 10,
             scan_result.status = ScanStatus.FAILED
             scan_result.error_message = crawl_results["error"]
             scan_result.completed_at = datetime.utcnow()
-            scan_dict = scan_result.model_dump()
-            scan_dict['created_at'] = scan_dict['created_at'].isoformat()
-            scan_dict['completed_at'] = scan_dict['completed_at'].isoformat()
-            redis_client.setex(f"scan:{scan_id}", 3600, json.dumps(scan_dict))
+            _persist(scan_result)
             
             return {
                 "status": "FAILED",
@@ -118,24 +204,33 @@ def scan_site(self, scan_id: str, url: str, max_pages: int = 10,
         scan_result.seo_score = crawl_results.get("seo_score")
         scan_result.performance_score = crawl_results.get("performance_score")
         scan_result.has_screenshot = bool(crawl_results.get("screenshot_path"))
-        scan_result.has_html_archive = bool(crawl_results.get("html_content"))
+        scan_result.has_html_archive = bool(crawl_results.get("html_pages"))
+        
+        # Write the HTML archive and page manifest once, so the API serves them
+        # straight from disk instead of holding page HTML in Redis
+        files_dir = scan_files_dir(scan_id)
+        archive_path = crawler.save_html_archive(os.path.join(files_dir, "archive.zip"))
+        pages_path = None
+        if archive_path:
+            pages_path = crawler.save_pages_json(os.path.join(files_dir, "pages.json"), {
+                "scan_id": scan_id,
+                "url": url,
+                "crawled_at": scan_result.completed_at.isoformat()
+            })
         
-        # Store additional data for file downloads
-        scan_result._crawler_data = {
+        # Only file locations go to Redis; page HTML lives on disk
+        crawler_data = {
             "screenshot_path": crawl_results.get("screenshot_path"),
-            "html_content": crawl_results.get("html_content", {}),
-            "crawler": crawler
+            "archive_path": archive_path,
+            "pages_path": pages_path
         }
         
-        scan_dict = scan_result.model_dump()
-        scan_dict['created_at'] = scan_dict['created_at'].isoformat()
-        scan_dict['completed_at'] = scan_dict['completed_at'].isoformat()
-        redis_client.setex(f"scan:{scan_id}", 3600, json.dumps(scan_dict))
-        # Store crawler data separately
-        redis_client.setex(f"crawler_data:{scan_id}", 3600, json.dumps({
-            "screenshot_path": crawl_results.get("screenshot_path"),
-            "html_content": crawl_results.get("html_content", {})
-        }))
+        # Both keys go out in one round-trip; no transaction is needed
+        with redis_client.pipeline(transaction=False) as pipe:
+            _persist(scan_result, pipe)
+            # Store crawler data separately
+            pipe.setex(f"crawler_data:{scan_id}", SCAN_TTL, orjson.dumps(crawler_data))
+            pipe.execute()
         
         self.update_state(
             state="SUCCESS",
@@ -149,17 +244,12 @@ def scan_site(self, scan_id: str, url: str, max_pages: int = 10,
         }
         
     except Exception as e:
-        # Update scan result with error
-        scan_data = redis_client.get(f"scan:{scan_id}")
-        if scan_data:
-            scan_result = ScanResult(**json.loads(scan_data))
+        # Update scan result with error, from the copy already in hand
+        if scan_result is not None:
             scan_result.status = ScanStatus.FAILED
             scan_result.error_message = str(e)
             scan_result.completed_at = datetime.utcnow()
-            scan_dict = scan_result.model_dump()
-            scan_dict['created_at'] = scan_dict['created_at'].isoformat()
-            scan_dict['completed_at'] = scan_dict['completed_at'].isoformat()
-            redis_client.setex(f"scan:{scan_id}", 3600, json.dumps(scan_dict))
+            _persist(scan_result)
         
         return {
             "status": "FAILED",
@@ -171,31 +261,39 @@ def get_scan_result(scan_id: str) -> ScanResult:
     """Get scan result by ID"""
     scan_data = redis_client.get(f"scan:{scan_id}")
     if scan_data:
-        scan_result = ScanResult(**json.loads(scan_data))
+        scan_result = ScanResult(**orjson.loads(scan_data))
         # Load crawler data if available
         crawler_data = redis_client.get(f"crawler_data:{scan_id}")
         if crawler_data:
-            scan_result._crawler_data = json.loads(crawler_data)
+            scan_result._crawler_data = orjson.loads(crawler_data)
         return scan_result
     return None
 
 
 def get_all_scans() -> list[ScanResult]:
     """Get all scan results"""
-    scans = []
-    for key in redis_client.keys("scan:*"):
-        scan_data = redis_client.get(key)
-        if scan_data:
-            scans.append(ScanResult(**json.loads(scan_data)))
-    return scans
+    # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS,
+    # and a single MGET fetches every scan in one round-trip
+    keys = list(redis_client.scan_iter(match="scan:*", count=500))
+    if not keys:
+        return []
+    return [
+        ScanResult(**orjson.loads(scan_data))
+        for scan_data in redis_client.mget(keys)
+        if scan_data  # expired between SCAN and MGET
+    ]
 
 
 def delete_scan(scan_id: str) -> bool:
     """Delete a scan result"""
     scan_key = f"scan:{scan_id}"
     crawler_key = f"crawler_data:{scan_id}"
-    if redis_client.exists(scan_key):
-        redis_client.delete(scan_key)
-        redis_client.delete(crawler_key)
+    # Check and delete both keys in a single round-trip
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.exists(scan_key)
+        pipe.delete(scan_key, crawler_key)
+        existed, _ = pipe.execute()
+    if existed:
+        shutil.rmtree(scan_files_dir(scan_id), ignore_errors=True)
         return True
     return False 
\ No newline at end of file
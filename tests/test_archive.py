@@ -0,0 +1,64 @@
+import io
+import zipfile
+
+from app import archive as archive_module
+from app.archive import iter_zip_chunks
+
+
+def build_zip(pages, **kwargs) -> zipfile.ZipFile:
+    data = b"".join(iter_zip_chunks(pages, **kwargs))
+    return zipfile.ZipFile(io.BytesIO(data))
+
+
+def test_round_trip():
+    pages = [
+        ("https://example.com/", b"<html>" + b"x" * 10000 + b"</html>"),
+        ("https://example.com/café", "<p>héllo</p>".encode() * 50),
+        ("https://example.com/empty", b""),
+    ]
+    archive = build_zip(pages)
+
+    assert archive.testzip() is None
+    assert [archive.read(info) for info in archive.infolist()] == [html for _, html in pages]
+
+
+def test_empty_archive():
+    archive = build_zip([])
+
+    assert archive.testzip() is None
+    assert archive.namelist() == []
+
+
+def test_long_urls_sharing_a_prefix_get_distinct_names():
+    prefix = "https://example.com/" + "a" * 200
+    archive = build_zip([(prefix + "1", b"one"), (prefix + "2", b"two")])
+
+    names = archive.namelist()
+    assert len(set(names)) == 2
+    assert all(name.isascii() and name.endswith(".html") for name in names)
+
+
+def test_output_is_deterministic():
+    pages = [("https://example.com/", b"<p>hi</p>")]
+
+    first = b"".join(iter_zip_chunks(pages))
+    assert first == b"".join(iter_zip_chunks(pages))
+    assert build_zip(pages).infolist()[0].date_time == (1980, 1, 1, 0, 0, 0)
+
+
+def test_every_compression_level_round_trips():
+    pages = [("https://example.com/", b"<p>hi</p>" * 1000)]
+
+    for level in (1, 6, 9):
+        archive = build_zip(pages, level=level)
+        assert archive.testzip() is None
+        assert archive.read(archive.namelist()[0]) == pages[0][1]
+
+
+def test_zlib_fallback_round_trips(monkeypatch):
+    monkeypatch.setattr(archive_module, "deflate", None)
+    pages = [("https://example.com/", b"<p>hi</p>" * 1000)]
+
+    archive = build_zip(pages)
+    assert archive.testzip() is None
+    assert archive.read(archive.namelist()[0]) == pages[0][1]
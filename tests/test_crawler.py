@@ -0,0 +1,277 @@
+import asyncio
+
+import pytest
+
+from app import crawler as crawler_module
+from app.crawler import (
+    INTERNAL_CRAWL_CONCURRENCY,
+    SiteCrawler,
+    _extract_links_from_html,
+)
+
+
+def test_extract_links_resolves_and_filters():
+    html = b"""
+        <a href="/about">About</a>
+        <a href="https://other.org/x?y=1">Other</a>
+        <a href="javascript:void(0)">JS</a>
+        <a href="mailto:hi@example.com">Mail</a>
+        <a href="">Empty</a>
+    """
+
+    assert _extract_links_from_html(html, "https://example.com/") == {
+        "https://example.com/about",
+        "https://other.org/x?y=1",
+    }
+
+
+def test_extract_links_skips_malformed_hosts():
+    html = b'<a href="http://[foo]/">a</a><a href="http://[oops">b</a><a href="/ok">c</a>'
+
+    assert _extract_links_from_html(html, "https://example.com/") == {"https://example.com/ok"}
+
+
+def test_extract_links_honours_base_href():
+    html = b'<head><base href="https://cdn.example.com/docs/"></head><a href="page">p</a>'
+
+    assert _extract_links_from_html(html, "https://example.com/") == {
+        "https://cdn.example.com/docs/page"
+    }
+
+
+def test_extract_links_encodes_spaces_like_a_browser():
+    html = b'<a href="/my page?q=a b">s</a><a href="/tab\tbed">t</a>'
+
+    assert _extract_links_from_html(html, "https://example.com/") == {
+        "https://example.com/my%20page?q=a%20b",
+        "https://example.com/tabbed",
+    }
+
+
+class FakeSite:
+    """Stands in for SiteCrawler._crawl_one, tracking how many pages load at once"""
+
+    def __init__(self, pages, delay=0.01):
+        self.pages = pages  # url -> set of links, or None for a page that fails
+        self.delay = delay
+        self.fetched = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, context, link, base_url):
+        self.fetched.append(link)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            links = self.pages.get(link)
+            if links is None:
+                raise RuntimeError(f"failed to load {link}")
+            return None, links
+        finally:
+            self.active -= 1
+
+
+def crawl_internal(pages, start_links, max_pages):
+    crawler = SiteCrawler(max_pages=max_pages, include_screenshots=False, include_html=False)
+    site = FakeSite(pages)
+    crawler._crawl_one = site
+    # Queue the homepage's links in the given order
+    crawler.seen.update(["https://example.com/", *start_links])
+    crawler.frontier.extend(start_links)
+    asyncio.run(crawler._crawl_internal_pages(object(), "https://example.com/", "example.com"))
+    return crawler, site
+
+
+def test_idle_workers_wait_for_pages_in_flight():
+    # The homepage links to a single hub, so every other worker starts idle
+    hub = "https://example.com/hub"
+    leaves = {f"https://example.com/{i}" for i in range(20)}
+    pages = {hub: leaves, **{leaf: set() for leaf in leaves}}
+
+    crawler, site = crawl_internal(pages, [hub], max_pages=50)
+
+    assert site.peak == INTERNAL_CRAWL_CONCURRENCY
+    assert crawler.crawled_urls == {hub} | leaves
+
+
+def test_crawl_never_exceeds_the_page_budget():
+    links = [f"https://example.com/{i}" for i in range(30)]
+    pages = {link: set() for link in links}
+
+    crawler, site = crawl_internal(pages, links, max_pages=5)
+
+    assert len(site.fetched) == 4
+    assert site.peak == 4
+    assert len(crawler.crawled_urls) == 4
+
+
+def test_failed_pages_release_their_budget():
+    bad = [f"https://example.com/bad{i}" for i in range(3)]
+    good = ["https://example.com/good1", "https://example.com/good2"]
+    pages = {link: set() for link in good}
+
+    crawler, site = crawl_internal(pages, bad + good, max_pages=3)
+
+    assert crawler.crawled_urls == set(good)
+    assert site.fetched == bad + good
+
+
+def test_crawl_stops_when_every_page_fails():
+    links = [f"https://example.com/{i}" for i in range(3)]
+
+    crawler, site = crawl_internal({}, links, max_pages=10)
+
+    assert crawler.crawled_urls == set()
+    assert site.fetched == links
+
+
+class FakePage:
+    def __init__(self, site):
+        self.site = site
+        self.url = "about:blank"
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    async def goto(self, url, **kwargs):
+        if url not in self.site:
+            raise RuntimeError(f"net::ERR_NAME_NOT_RESOLVED at {url}")
+        self.url = url
+
+    async def wait_for_load_state(self, state, **kwargs):
+        pass
+
+    async def content(self):
+        return self.site[self.url]
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, site):
+        self.site = site
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return FakePage(self.site)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Serves pages from a dict of url -> HTML"""
+
+    def __init__(self, site):
+        self.site = site
+        self.contexts = []
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self.site)
+        self.contexts.append(context)
+        return context
+
+
+HOMEPAGE = "https://example.com/"
+SITE = {
+    HOMEPAGE: """
+        <a href="/">Home</a>
+        <a href="/a">A</a>
+        <a href="/b">B</a>
+        <a href="https://other.org/">Other</a>
+    """,
+    "https://example.com/a": '<a href="/">Home</a><a href="/b">B</a><a href="/c">C</a>',
+    "https://example.com/b": '<a href="/a">A</a><a href="https://other.org/x">X</a>',
+    "https://example.com/c": "",
+}
+
+
+@pytest.fixture
+def no_lookups(monkeypatch):
+    monkeypatch.setattr(SiteCrawler, "_get_domain_info", lambda self, url: None)
+    monkeypatch.setattr(SiteCrawler, "_get_ip_info", lambda self, url: None)
+
+
+def crawl(max_pages, site=SITE):
+    crawler = SiteCrawler(max_pages=max_pages, include_screenshots=False,
+                          browser=FakeBrowser(site))
+    return crawler, asyncio.run(crawler.crawl_site(HOMEPAGE))
+
+
+@pytest.mark.parametrize("max_pages", [1, 2, 10])
+def test_every_link_is_internal_or_external(no_lookups, max_pages):
+    crawler, results = crawl(max_pages)
+
+    assert crawler.internal_links | crawler.external_links == crawler.all_links
+    assert not crawler.internal_links & crawler.external_links
+    assert results["internal_links"] + results["external_links"] == results["total_links"]
+    # The homepage's link to itself counts as internal whatever the budget
+    assert HOMEPAGE in crawler.internal_links
+
+
+def test_single_page_scan_matches_the_homepage_split(no_lookups):
+    single, _ = crawl(1)
+    crawled, _ = crawl(2, site={**SITE, "https://example.com/a": "", "https://example.com/b": ""})
+
+    assert single.internal_links == crawled.internal_links
+    assert single.external_links == crawled.external_links
+
+
+def test_seen_only_gates_the_frontier():
+    crawler = SiteCrawler()
+    crawler.seen.add(HOMEPAGE)
+
+    crawler._add_links({HOMEPAGE, f"{HOMEPAGE}a", "https://other.org/"}, "example.com")
+    assert list(crawler.frontier) == [f"{HOMEPAGE}a"]
+    assert crawler.internal_links == {HOMEPAGE, f"{HOMEPAGE}a"}
+
+    # Repeated links are neither re-queued nor re-counted
+    crawler._add_links({HOMEPAGE, f"{HOMEPAGE}a", f"{HOMEPAGE}b"}, "example.com")
+    assert list(crawler.frontier) == [f"{HOMEPAGE}a", f"{HOMEPAGE}b"]
+    assert crawler.internal_links | crawler.external_links == crawler.all_links
+    assert len(crawler.all_links) == 4
+
+
+def test_each_page_is_crawled_once(no_lookups):
+    crawler, results = crawl(10)
+
+    assert crawler.crawled_urls == {f"{HOMEPAGE}a", f"{HOMEPAGE}b", f"{HOMEPAGE}c"}
+    assert results["pages_crawled"] == 4
+
+
+def test_injected_browser_bypasses_the_pool(no_lookups, monkeypatch):
+    async def no_pool():
+        raise AssertionError("the pooled browser should not be used")
+
+    monkeypatch.setattr(crawler_module, "get_browser", no_pool)
+    browser = FakeBrowser(SITE)
+    crawler = SiteCrawler(max_pages=1, include_screenshots=False, browser=browser)
+
+    results = asyncio.run(crawler.crawl_site(HOMEPAGE))
+
+    assert "error" not in results
+    # One context per scan, closed afterwards; the browser itself stays up
+    assert len(browser.contexts) == 1
+    assert browser.contexts[0].closed
+
+
+def test_navigation_failure_reports_an_error(no_lookups, monkeypatch):
+    sleep = asyncio.sleep
+
+    async def no_backoff(delay):
+        await sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", no_backoff)
+    crawler = SiteCrawler(max_pages=1, include_screenshots=False, browser=FakeBrowser({}))
+
+    results = asyncio.run(crawler.crawl_site(HOMEPAGE))
+
+    assert "ERR_NAME_NOT_RESOLVED" in results["error"]
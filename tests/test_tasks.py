@@ -0,0 +1,28 @@
+import os
+import time
+
+from app import tasks
+
+
+def make_scan_dir(root, name, age):
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    open(os.path.join(path, "archive.zip"), "wb").close()
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_sweep_removes_only_expired_scan_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(tasks, "DOWNLOADS_DIR", str(tmp_path))
+    make_scan_dir(tmp_path, "expired", tasks.SCAN_TTL + 60)
+    make_scan_dir(tmp_path, "fresh", 60)
+
+    tasks.sweep_expired_scan_files()
+
+    assert os.listdir(tmp_path) == ["fresh"]
+
+
+def test_sweep_without_downloads_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tasks, "DOWNLOADS_DIR", str(tmp_path / "missing"))
+
+    tasks.sweep_expired_scan_files()